@@ -1,7 +1,184 @@
 import typing as t
+import re
+import codecs
+from binascii import hexlify
+from functools import lru_cache
 from html import unescape as unescape_html
 import urllib.parse as up
 
+# matches any character which would be percent-encoded by urllib.parse.quote with default safe characters
+_NEEDS_QUOTE = re.compile(r'[^A-Za-z0-9_.\-~/]')
+
+# percent-encoded representation of every byte - unreserved characters and '/' are kept as they are
+_SAFE_BYTES = frozenset(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-~/')
+_QUOTE_BYTES = tuple(bytes((b,)) if b in _SAFE_BYTES else b'%%%02X' % b for b in range(256))
+# percent-encoded representation of ASCII characters which have to be encoded - table for str.translate
+_QUOTE_ASCII = {b: '%%%02X' % b for b in range(128) if b not in _SAFE_BYTES}
+# deletion table for bytes.translate - nothing is left of a value consisting only of safe bytes
+_SAFE_DELETE = bytes(sorted(_SAFE_BYTES))
+
+# runs of bytes which have to be percent-encoded
+_UNSAFE_RUN = re.compile(rb'[^A-Za-z0-9_.\-~/]+')
+# from this length on, encoding whole runs of unsafe bytes beats per-byte table lookup
+_RUN_ENCODE_MIN_LENGTH = 64
+
+
+def _encode_run(match: re.Match) -> bytes:
+    """
+    Percent-encodes matched run of unsafe bytes at once - e.g. b'\\xc3\\xa6' -> b'%C3%A6'
+    """
+    return b'%' + hexlify(match[0], b'%').upper()
+
+
+def _is_safe(value: str) -> bool:
+    """
+    Checks whether string contains only characters which are not percent-encoded. Short values are searched by regex,
+    long values are checked by deleting safe bytes in C with bytes.translate.
+
+    Args:
+        value (str): string to check
+
+    Returns:
+        bool: True if string can be used without encoding
+    """
+    if len(value) < _RUN_ENCODE_MIN_LENGTH:
+        return _NEEDS_QUOTE.search(value) is None
+    return value.isascii() and not value.encode('ascii').translate(None, _SAFE_DELETE)
+
+
+# charsets which str.encode and bytes.decode handle without codec lookup
+_BUILTIN_CHARSETS = frozenset(('utf-8', 'utf8', 'iso-8859-1', 'latin-1', 'latin1', 'ascii'))
+
+
+@lru_cache(maxsize=16)
+def _lookup_codec(charset: str) -> codecs.CodecInfo:
+    """
+    Looks up codec of charset, cached per charset.
+    """
+    return codecs.lookup(charset)
+
+
+def _encode_str(value: str, charset: str) -> bytes:
+    """
+    Encodes string in charset, characters not available in charset are replaced with numeric entities.
+    Codecs of charsets without built-in fast path are looked up only once.
+    """
+    if charset in _BUILTIN_CHARSETS:
+        return value.encode(charset, 'xmlcharrefreplace')
+    return _lookup_codec(charset).encode(value, 'xmlcharrefreplace')[0]
+
+
+def _decode_bytes(raw: bytes, charset: str) -> str:
+    """
+    Decodes bytes in charset, undecodable bytes are replaced.
+    Codecs of charsets without built-in fast path are looked up only once.
+    """
+    if charset in _BUILTIN_CHARSETS:
+        return raw.decode(charset, 'replace')
+    return _lookup_codec(charset).decode(raw, 'replace')[0]
+
+
+@lru_cache(maxsize=16)
+def _ascii_compatible(charset: str) -> bool:
+    """
+    Checks whether charset encodes ASCII characters to the same bytes as ASCII does, cached per charset.
+    """
+    ascii_bytes = bytes(range(128))
+    try:
+        return ascii_bytes.decode('ascii').encode(charset) == ascii_bytes
+    except (LookupError, UnicodeError):
+        return False
+
+
+def _ascii_charset(charset: str) -> bool:
+    """
+    Checks whether ASCII characters keep their bytes in charset - built-in charsets skip the cached check.
+    """
+    return charset in _BUILTIN_CHARSETS or _ascii_compatible(charset)
+
+
+def _encode_bytes(raw: bytes) -> bytes:
+    """
+    Percent-encodes bytes. Short values are mapped byte by byte through precomputed table, long values are encoded
+    by runs of unsafe bytes so that safe parts are copied and unsafe parts are hex-encoded in C.
+
+    Args:
+        raw (bytes): bytes to encode
+
+    Returns:
+        bytes: percent-encoded bytes
+    """
+    if len(raw) < _RUN_ENCODE_MIN_LENGTH:
+        return b''.join(map(_QUOTE_BYTES.__getitem__, raw))
+    return _UNSAFE_RUN.sub(_encode_run, raw)
+
+
+# numeric character reference - decimal or hexadecimal, terminating semicolon is optional same as in HTML
+_NUMERIC_ENTITY = re.compile(r'&#(?:[xX][0-9a-fA-F]+|[0-9]+);?')
+
+
+def _unescape_entity(match: re.Match) -> str:
+    """
+    Interprets matched numeric entity - e.g. '&#9786;' -> '☺'
+    """
+    return unescape_html(match[0])
+
+
+def _unescape_numeric(value: str) -> str:
+    """
+    Interprets numeric entities in string, named entities (e.g. '&amp;') are left as they are.
+
+    Args:
+        value (str): string to interpret
+
+    Returns:
+        str: string with numeric entities replaced by unicode characters
+    """
+    if '&#' not in value:
+        return value
+    return _NUMERIC_ENTITY.sub(_unescape_entity, value)
+
+
+def _unquote(value: str, charset: str = 'utf-8') -> str:
+    """
+    Decodes percent-encoded string, same as urllib.parse.unquote. ASCII strings (as encoded query strings usually are)
+    are decoded to bytes at once when charset encodes ASCII as ASCII, urllib.parse.unquote would first split them to
+    ASCII runs by regex.
+
+    Args:
+        value (str): string to decode
+        charset (str): charset of percent-encoded bytes
+
+    Returns:
+        str: decoded string
+    """
+    if value.isascii() and _ascii_charset(charset):
+        return _decode_bytes(up.unquote_to_bytes(value), charset)
+    return up.unquote(value, charset)
+
+
+# iterators over (key, value) pairs of nested containers, keyed by exact type
+_CHILD_ITEMS = {dict: dict.items, list: enumerate}
+# types which are always loaded as leaf values
+_LEAF_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _child_items_of(data: t.Any) -> t.Callable[[t.Any], t.Iterable[tuple]] | None:
+    """
+    Resolves iterator over children of types not known in advance - e.g. subclasses of dict or list.
+
+    Args:
+        data (Any): data to resolve
+
+    Returns:
+        Callable: function returning (key, value) pairs of data or None if data is a leaf value
+    """
+    if isinstance(data, dict):
+        return type(data).items
+    if isinstance(data, list):
+        return enumerate
+    return None
+
 
 class Unparsable(Exception):
     """Exception raised when query string cannot be parsed with QsParser"""
@@ -59,22 +236,26 @@ class QsNode:
         Returns:
             QsNode: current node
         """
-        root = cls(parent_key, None)
+        # filtered keys are pruned before any node is created
         if filter and parent_key not in filter:
             return None
-        if isinstance(data, dict):
-            for k, v in data.items():
-                child = cls.load(k, v, filter=filter)
-                if child is not None:
-                    root.children.append(child)
-        elif isinstance(data, list):
-            # list of dictionaries, indexed
-            for i, v in enumerate(data):
-                child = cls.load(i, v, filter=filter)
-                if child is not None:
-                    root.children.append(child)
+        root = cls(parent_key, None)
+        # dispatch by exact type, isinstance is used only for types not known in advance
+        data_type = type(data)
+        if data_type in _LEAF_TYPES:
+            child_items = None
         else:
+            child_items = _CHILD_ITEMS.get(data_type) or _child_items_of(data)
+        if child_items is None:
             root.value = data
+        elif data:
+            # dictionary items or indexed list items
+            children = root.children
+            for k, v in child_items(data):
+                child = cls.load(k, v, filter=filter)
+                if child is not None:
+                    children.append(child)
+        # empty containers are left as leafs without value - skipped when stringified
         return root
 
     def __getitem__(self, key: str):
@@ -90,10 +271,11 @@ class QsNode:
         """
         Method to get child by key with default value - behaves like dict.get
         """
-        try:
-            return self[key]
-        except KeyError:
-            return default
+        # children are scanned directly - missing key is common while merging and raising KeyError is costly
+        for child in self.children:
+            if child.key == key:
+                return child
+        return default
 
     def __contains__(self, key: str):
         """
@@ -108,7 +290,7 @@ class QsNode:
         """
         Check if node is a leaf - has no children
         """
-        return self.children is None or len(self.children) == 0
+        return not self.children
 
     def has_int_key(self):
         """
@@ -120,14 +302,14 @@ class QsNode:
         """
         Check if node is an array - all children have integer keys - values might be nested
         """
-        if self.value is None and all([child.has_int_key() for child in self.children]):
+        if self.value is None and all(child.has_int_key() for child in self.children):
             return True
 
     def is_default_array(self):
         """
         Check if node is a default array - all children have integer keys and are leafs
         """
-        if self.is_array() and all([child.is_leaf() for child in self.children]):
+        if self.is_array() and all(child.is_leaf() for child in self.children):
             return True
 
     def max_index(self) -> int:
@@ -135,7 +317,7 @@ class QsNode:
         Used to determine the next index for a new array item
         """
         # method is only called within _parse_array method but this is security measure
-        return max([child.key for child in self.children]) if self.is_array() else -1
+        return max(child.key for child in self.children) if self.is_array() else -1
 
     def to_object_notation(self):
         """
@@ -167,27 +349,39 @@ class QsNode:
         Returns:
             None
         """
-        if self.is_leaf() and other.is_leaf():
+        # leaf state of both nodes is checked once - update is the hottest path of parsing
+        self_leaf, other_leaf = not self.children, not other.children
+        if self_leaf and other_leaf:
             self.merge_value(other)
-        elif self.is_leaf() and not other.is_leaf():
+        elif self_leaf:
             self.children = [QsNode(str(self.value), True)]
             self.value = None
-            for child in other.children:
-                if child.key in self:
-                    self[child.key].update(child)
-                else:
-                    self.children.append(child)
-            self.reorder()
-        elif not self.is_leaf() and other.is_leaf():
+            self._merge_children(other)
+        elif other_leaf:
             self.children.append(QsNode(other.value, True))
             self.reorder()
         else:
-            for child in other.children:
-                if child.key in self:
-                    self[child.key].update(child)
-                else:
-                    self.children.append(child)
-            self.reorder()
+            self._merge_children(other)
+
+    def _merge_children(self, other: 'QsNode'):
+        """
+        Merge children of other node into self in place - matching children are updated, others are appended
+
+        Args:
+            other (QsNode): node to merge children from
+
+        Returns:
+            None
+        """
+        children = self.children
+        for child in other.children:
+            # single scan per child - matching child is looked up only once
+            match = self.get(child.key)
+            if match is None:
+                children.append(child)
+            else:
+                match.update(child)
+        self.reorder()
 
     def merge_value(self, other: 'QsNode'):
         """
@@ -246,16 +440,25 @@ class QS:
     """
     Base class for query string parser and stringifier
     """
-    _qs_tree: dict[str, QsNode]
+    __slots__ = (
+        '_qs_tree',
+        '_max_depth',
+        '_parameter_limit',
+        '_allow_dots',
+        '_array_limit',
+        '_parse_arrays',
+        '_allow_empty',
+        '_comma',
+    )
 
-    _depth: int = 5
-    _depth: int = 5
-    _parameter_limit: int = 1000
-    _allow_dots: bool = False
-    _array_limit: int = 20
-    _parse_arrays: bool = False
-    _allow_empty: bool = False
-    _comma: bool = False
+    _qs_tree: dict[str, QsNode]
+    _max_depth: int
+    _parameter_limit: int
+    _allow_dots: bool
+    _array_limit: int
+    _parse_arrays: bool
+    _allow_empty: bool
+    _comma: bool
 
     def __init__(
             self,
@@ -293,6 +496,26 @@ class QS:
         self._allow_empty = allow_empty
         self._comma = comma
 
+    @staticmethod
+    def _split_arg(arg: str) -> tuple[str, str]:
+        """
+        Splits argument into key and value.
+
+        Args:
+            arg (str): argument to split
+
+        Returns:
+            tuple[str, str]: key and value
+
+        Raises:
+            Unparsable: if argument does not contain exactly one '='
+        """
+        try:
+            arg_key, arg_val = arg.split('=')
+        except ValueError:
+            raise Unparsable('Unable to parse key')
+        return (arg_key, arg_val)
+
     @staticmethod
     def _unq(arg: str, charset: str = 'utf-8', interpret_numeric_entities: bool = False) -> str:
         """
@@ -306,13 +529,13 @@ class QS:
         Returns:
             str: unquoted string
         """
-        try:
-            arg_key, arg_val = arg.split('=')
-        except ValueError:
-            raise Unparsable('Unable to parse key')
+        arg_key, arg_val = QS._split_arg(arg)
+        if '%' in arg:
+            # nothing to unquote otherwise
+            arg_key, arg_val = _unquote(arg_key, charset), _unquote(arg_val, charset)
         if interpret_numeric_entities:
-            return (unescape_html(up.unquote(arg_key, charset)), unescape_html(up.unquote(arg_val, charset)))
-        return (up.unquote(arg_key, charset), up.unquote(arg_val, charset))
+            return (_unescape_numeric(arg_key), _unescape_numeric(arg_val))
+        return (arg_key, arg_val)
 
     @staticmethod
     def _q(key: str, value: str, charset: str = 'utf-8') -> str:
@@ -327,4 +550,73 @@ class QS:
         Returns:
             str: encoded string
         """
-        return f'{up.quote(key, encoding=charset, errors="xmlcharrefreplace")}={up.quote(value, encoding=charset, errors="xmlcharrefreplace")}'
+        return f'{QS._quote(key, charset)}={QS._quote(value, charset)}'
+
+    @staticmethod
+    def _quote(value: str, charset: str = 'utf-8') -> str:
+        """
+        Percent-encodes a string using precomputed byte table, same as urllib.parse.quote with default safe characters.
+        Characters not available in charset are replaced with numeric entities.
+
+        Args:
+            value (str): string to encode
+            charset (str): charset to use for encoding
+
+        Returns:
+            str: encoded string
+        """
+        if not value:
+            # nothing to encode - codecs with byte order mark would emit it even for empty string
+            return ''
+        if _ascii_charset(charset):
+            # ASCII characters are encoded to the same bytes - safe values are kept, others are mapped directly
+            if _is_safe(value):
+                return value
+            if value.isascii():
+                return value.translate(_QUOTE_ASCII)
+        return _encode_bytes(_encode_str(value, charset)).decode('ascii')
+
+    @staticmethod
+    def _quote_into(buf: bytearray, value: str, charset: str = 'utf-8') -> None:
+        """
+        Percent-encodes a string same as _quote, but appends encoded bytes to buffer.
+
+        Args:
+            buf (bytearray): buffer to append to
+            value (str): string to encode
+            charset (str): charset to use for encoding
+        """
+        if not value:
+            return
+        if _ascii_charset(charset):
+            if _is_safe(value):
+                buf += value.encode('ascii')
+                return
+            if value.isascii():
+                buf += value.translate(_QUOTE_ASCII).encode('ascii')
+                return
+        buf += _encode_bytes(_encode_str(value, charset))
+
+    @staticmethod
+    def _encode_pairs(pairs: t.Iterable[tuple[str, str]], delimiter: str = '&', charset: str = 'utf-8') -> str:
+        """
+        Encodes key-value pairs into a query string, pairs are assembled in single buffer.
+
+        Args:
+            pairs (Iterable[tuple[str, str]]): key-value pairs to encode
+            delimiter (str): delimiter to use
+            charset (str): charset to use for encoding
+
+        Returns:
+            str: encoded query string
+        """
+        buf = bytearray()
+        sep = delimiter.encode('utf-8')
+        for key, value in pairs:
+            # buffer is never empty after first pair as it contains at least '='
+            if buf:
+                buf += sep
+            QS._quote_into(buf, key, charset)
+            buf += b'='
+            QS._quote_into(buf, value, charset)
+        return buf.decode('utf-8')
@@ -1,22 +1,143 @@
 import typing as t
+import sys
 import urllib.parse as up
 import re
+from functools import lru_cache
 from .base import QS, Unparsable, UnbalancedBrackets, QsNode, EmptyKey, ArrayLimitReached
 from html import unescape as unescape_html
 
 
 t_Delimiter = t.Union[str, t.Pattern[str]]
 
+# tokens recognized as primitive values
+_BOOL_TOKENS = frozenset(('true', 'false'))
+_NONE_STRICT = frozenset(('null', 'None'))
+_NONE_LOOSE = frozenset(('null', 'none'))
+
+# ascii characters float() accepts as first character - digits, sign, dot, inf/nan and whitespace
+_FLOAT_START = frozenset(
+    '0123456789+-.iInN' + ''.join(c for c in map(chr, range(128)) if c.isspace()))
+
+
+def _is_word(key: str, allow_empty: bool = False) -> bool:
+    """
+    Checks if key consists of word characters only - equivalent of matching regular expression \\w+ (or \\w*)
+    """
+    if not key:
+        return allow_empty
+    return key.isalnum() or key.replace('_', 'a').isalnum()
+
+
+def _word_prefix(part: str) -> str:
+    """
+    Returns leading run of word characters - equivalent of matching regular expression \\w*
+    """
+    if _is_word(part, True):
+        return part
+    for idx, char in enumerate(part):
+        if not (char.isalnum() or char == '_'):
+            return part[:idx]
+    return part
+
+
+# keys shorter than this length are interned when split
+_INTERN_MAX_LENGTH = 32
+# keys up to this length are split through cache - cache of 4096 keys cannot pin arbitrarily long keys in memory
+_CACHE_MAX_KEY_LENGTH = 128
+
+
+def _intern_keys(keys: t.Iterable[str]) -> tuple[str, ...]:
+    """
+    Interns short ASCII keys, so that keys repeated across different arguments share single object and compare
+    by identity. Long or non-ASCII keys are kept as they are to keep intern table small.
+    """
+    return tuple(
+        sys.intern(key) if len(key) < _INTERN_MAX_LENGTH and key.isascii() else key for key in keys)
+
+
+def _split_dots(k: str, allow_empty: bool) -> tuple[str, ...] | None:
+    """
+    Splits key with dot notation into a main key and a list of nested keys. Key is split on dots at once, nested keys
+    are leading word characters of each part - text following them (e.g. brackets) is ignored.
+
+    Args:
+        k (str): key to split
+        allow_empty (bool): allow empty keys
+
+    Returns:
+        tuple[str, ...]: main key followed by nested keys or None if key does not start with dot notation
+    """
+    parts = k.split('.')
+    if len(parts) < 2 or not _is_word(parts[0], allow_empty):
+        return None
+    nested = [_word_prefix(part) for part in parts[1:]]
+    if allow_empty:
+        return (parts[0], *nested)
+    if not nested[0]:
+        return None
+    return (parts[0], *[key for key in nested if key])
+
+
+# characters which make a single character delimiter a regular expression
+_REGEX_META = frozenset('.^$*+?{}[]\\|()')
+
+
+@lru_cache(maxsize=64)
+def _compile_delimiter(delimiter: str) -> t.Pattern[str]:
+    """
+    Compiles regular expression delimiter, cached per pattern.
+    """
+    return re.compile(delimiter)
+
+
+# delimiter consisting of single character class of plain characters - e.g. '[;,]'
+_CHAR_CLASS = re.compile(r'\[([^\[\]\\^\-]+)\]')
+
+
+@lru_cache(maxsize=64)
+def _class_chars(delimiter: str) -> str | None:
+    """
+    Extracts characters of delimiter consisting of single character class, cached per pattern.
+    """
+    match = _CHAR_CLASS.fullmatch(delimiter)
+    return match[1] if match is not None else None
+
+
+def _split_args(qs: str, delimiter: t_Delimiter) -> list[str]:
+    """
+    Splits query string into arguments by delimiter.
+    Plain delimiters (without regex metacharacters) and single character classes are split with str.split, anything
+    else is handled as regular expression.
+
+    Args:
+        qs (str): query string to split
+        delimiter (str | Pattern): delimiter to split by
+
+    Returns:
+        list: list of arguments
+    """
+    if isinstance(delimiter, str):
+        if delimiter and _REGEX_META.isdisjoint(delimiter):
+            # pattern without metacharacters matches only itself
+            return qs.split(delimiter)
+        chars = _class_chars(delimiter)
+        if chars is not None:
+            # every character of class is replaced by the first one, so that single str.split is enough
+            sep = chars[0]
+            for char in chars[1:]:
+                qs = qs.replace(char, sep)
+            return qs.split(sep)
+        return _compile_delimiter(delimiter).split(qs)
+    return delimiter.split(qs)
+
 
 class ArrayParse:
     """
     Parses array notation into a tree like structure.
     """
-    _depth: int = 5
-    _limit: int = 20
 
-    @classmethod
-    def process(cls, notation: list, val: str, depth: int = 5, max_limit: int = 20) -> QsNode:
+    @staticmethod
+    def process(notation: list, val: str, depth: int = 5, max_limit: int = 20) -> QsNode:
         """
         Parses array notation for single key-value pair.
 
@@ -29,18 +150,17 @@ class ArrayParse:
         Returns:
             list: parsed item into dictionary
         """
-        cls._limit = max_limit
-        cls._depth = depth
-        return cls.process_notation(notation, val)
+        return ArrayParse.process_notation(notation, val, max_limit)
 
-    @classmethod
-    def process_notation(cls, notation: list[str], val: t.Any) -> QsNode:
+    @staticmethod
+    def process_notation(notation: list[str], val: t.Any, limit: int = 20) -> QsNode:
         """
-        Parses array notation recursively.
+        Parses array notation iteratively - tree is built from the innermost key outwards.
 
         Args:
-            notation (list): list of remaining keys (in nested order)
+            notation (list): list of keys (in nested order)
             val (str): value to assign to the last key
+            limit (int): max number of elements in array
 
         Returns:
             QsNode: tree like structure of parsed data
@@ -48,23 +168,20 @@ class ArrayParse:
         Raises:
             ArrayLimitReached: if array limit is reached
         """
-        if not notation:
-            return val
-        current = notation[0]
-        if current.isdigit():
-            if int(current) > cls._limit:
-                raise ArrayLimitReached('Array limit reached')
-            return QsNode(int(current), cls.process_notation(notation[1:], val))
-        elif current == '':
-            res = cls.process_notation(notation[1:], val)
-            if not isinstance(res, QsNode):
-                return QsNode(None, res)
-            if not res.has_int_key() and res.key is not None:
-                # initialization of array without index - set index None to be handled by parser
-                return QsNode(None, res)
-            return res
-        else:
-            return QsNode(current, cls.process_notation(notation[1:], val))
+        node = val
+        for current in reversed(notation):
+            if current.isdecimal():
+                index = int(current)
+                if index > limit:
+                    raise ArrayLimitReached('Array limit reached')
+                node = QsNode(index, node)
+            elif current == '':
+                if not isinstance(node, QsNode) or (not node.has_int_key() and node.key is not None):
+                    # initialization of array without index - set index None to be handled by parser
+                    node = QsNode(None, node)
+            else:
+                node = QsNode(current, node)
+        return node
 
 
 class LHSParse:
@@ -72,13 +189,8 @@ class LHSParse:
     Parses left hand side notation into a tree like structure.
     """
 
-    _depth: int = 5
-    _dots: bool = False
-    _allow_empty: bool = False
-
-    @classmethod
+    @staticmethod
     def process(
-        cls,
         notation: list,
         val: str,
         depth: int = 5,
@@ -95,57 +207,59 @@ class LHSParse:
             allow_empty (bool): allow empty keys
             allow_dots (bool): allow dot notation
         """
-        cls._depth = depth
-        cls._allow_empty = allow_empty
-        cls._dots = allow_dots
-        return cls.process_notation(notation, val)
+        return LHSParse.process_notation(notation, val, depth, allow_dots)
 
-    @classmethod
-    def process_notation(cls, notation: list[str], val: t.Any) -> QsNode:
+    @staticmethod
+    def process_notation(notation: list[str], val: t.Any, depth: int = 5, allow_dots: bool = False) -> QsNode:
         """
-        Parses left hand side notation recursively.
+        Parses left hand side notation iteratively - tree is built from the innermost key outwards.
 
         Args:
-            notation (list): list of remaining keys (in nested order)
+            notation (list): list of keys (in nested order)
             val (str): value to assign to the last key
+            depth (int): max depth of nested objects
+            allow_dots (bool): allow dot notation
 
         Returns:
-            dict: parsed sub-dictionary
+            QsNode: tree like structure of parsed data
 
         Raises:
             EmptyKey: if empty key is found and not allowed
         """
-        if not notation:
-            return val
-        current = notation[0]
-        if cls._depth < 0:
-            # join current and rest of notation
-            current_key = cls._max_depth_key(notation)
-            return QsNode(current_key, val)
-        cls._depth -= 1
-        return QsNode(current, cls.process_notation(notation[1:], val))
+        # main key and up to depth nested keys are kept, rest of notation is joined into single key
+        split = max(depth + 1, 0)
+        node = val
+        if len(notation) > split:
+            node = QsNode(LHSParse._max_depth_key(notation[split:], allow_dots), node)
+            notation = notation[:split]
+        for current in reversed(notation):
+            node = QsNode(current, node)
+        return node
 
-    @classmethod
-    def _max_depth_key(cls, notation: list[str]) -> str:
+    @staticmethod
+    def _max_depth_key(notation: list[str], allow_dots: bool = False) -> str:
         """
         Returns a key for max depth reached. 
 
         Args:
             notation (list): list of remaining keys (in nested order)
+            allow_dots (bool): join keys with dot notation
 
         Returns:
             str: key for max depth reached
         """
         if len(notation) == 1:
             return notation[0]
-        if cls._dots:
+        if allow_dots:
             return f'{".".join(notation)}'
         return f'[{"][".join(notation)}]'
 
 
 class QsParser(QS):
-    _parse_primitive: bool = False
-    _primitive_strict: bool = True
+    __slots__ = ('_parse_primitive', '_primitive_strict')
+
+    _parse_primitive: bool
+    _primitive_strict: bool
 
     def __init__(
             self,
@@ -171,13 +285,17 @@ class QsParser(QS):
         Args:
             args (list): list of key-value pairs
         """
-        for arg in args:
-            parse_func = self._parse_array if self._parse_arrays else self._parse_lhs
-            k, v = arg
-            if self._comma:
-                v = re.split(',', v)
-                v = str(v[0]) if len(v) == 1 else v
-            parse_func(k, v)
+        parse_array, parse_lhs = self._parse_array, self._parse_lhs
+        comma = self._comma
+        for k, v in args:
+            if comma:
+                v = v.split(',')
+                v = v[0] if len(v) == 1 else v
+            # array parsing might be turned off by previous argument
+            if self._parse_arrays:
+                parse_array(k, v)
+            else:
+                parse_lhs(k, v)
 
     @property
     def args(self) -> dict[str, str]:
@@ -201,15 +319,25 @@ class QsParser(QS):
         """
         utf_idx = None
         for idx, arg in enumerate(args):
-            if arg.split('=')[0] == 'utf8':
+            if arg.startswith('utf8='):
                 utf_idx = idx
                 break
         if utf_idx is None:
             return None
         val = args.pop(utf_idx).split('=')[1]
-        if up.unquote(val, encoding='utf-8') == '✓':
+        if '%' not in val:
+            # nothing to unquote - compare raw value
+            utf_val = iso_val = val
+        elif val.isascii():
+            # percent-encoded bytes are decoded only once, then interpreted in both charsets
+            raw = up.unquote_to_bytes(val)
+            utf_val, iso_val = raw.decode('utf-8', 'replace'), raw.decode('iso-8859-1', 'replace')
+        else:
+            utf_val = up.unquote(val, encoding='utf-8')
+            iso_val = up.unquote(val, encoding='iso-8859-1')
+        if utf_val == '✓':
             return 'utf-8'
-        elif unescape_html(up.unquote(val, encoding='iso-8859-1')) == '✓':
+        elif unescape_html(iso_val) == '✓':
             return 'iso-8859-1'
         else:
             raise Unparsable('Unable to parse charset sentinel')
@@ -226,9 +354,9 @@ class QsParser(QS):
             list: converted list
         """
 
-        if isinstance(v, str) and (v.startswith('[') and v.endswith(']')):
-            v = v.rstrip(']').lstrip('[')
-            return v.split(',')
+        if isinstance(v, str) and len(v) >= 2 and v[0] == '[' and v[-1] == ']':
+            # strip exactly one pair of wrapping brackets
+            return v[1:-1].split(',')
         return v
 
     @staticmethod
@@ -243,21 +371,74 @@ class QsParser(QS):
             UnbalancedBrackets: if brackets are unbalanced
             Unparsable: if nesting notation is broken
         """
-        brackets = [char for char in k if char in '[]']
-        # check if brackets are balanced
-        bracket_count = 0
-        for bracket in brackets:
-            if bracket == '[' and bracket_count > 0:
+        if '[' not in k:
+            if ']' in k:
+                raise UnbalancedBrackets('Unbalanced brackets')
+            return
+        if k.count('[') != k.count(']'):
+            raise UnbalancedBrackets('Unbalanced brackets')
+        # check if brackets are balanced - only single level of brackets is allowed, brackets are looked up by str.find
+        start = k.find('[')
+        if ']' in k[:start]:
+            raise UnbalancedBrackets('Unbalanced brackets')
+        while start >= 0:
+            end = k.find(']', start + 1)
+            if end < 0:
+                raise UnbalancedBrackets('Unbalanced brackets')
+            if '[' in k[start + 1:end]:
                 raise UnbalancedBrackets(
                     'Using brackets as key is not allowed')
-            if bracket == ']' and bracket_count == 0:
+            start = k.find('[', end + 1)
+            if ']' in (k[end + 1:start] if start >= 0 else k[end + 1:]):
                 raise UnbalancedBrackets('Unbalanced brackets')
-            bracket_count += 1 if bracket == '[' else -1
-        if bracket_count != 0:
-            raise UnbalancedBrackets('Unbalanced brackets')
-        if brackets and not k.endswith(']'):
+        if k[-1] != ']':
             raise Unparsable('Nesting notation broken')
 
+    @staticmethod
+    def _scan_brackets(k: str) -> list[str] | None:
+        """
+        Splits key with brackets notation into a main key and a list of nested keys, brackets are validated
+        in the same pass.
+
+        Args:
+            k (str): key to split
+
+        Returns:
+            list[str]: main key followed by nested keys or None if there is text between nested keys
+
+        Raises:
+            UnbalancedBrackets: if brackets are unbalanced
+            Unparsable: if nesting notation is broken
+        """
+        start = k.find('[')
+        if start < 0:
+            if ']' in k:
+                raise UnbalancedBrackets('Unbalanced brackets')
+            return [k]
+        if ']' in k[:start]:
+            raise UnbalancedBrackets('Unbalanced brackets')
+        notation = [k[:start]]
+        broken = False
+        while start >= 0:
+            end = k.find(']', start + 1)
+            if end < 0:
+                raise UnbalancedBrackets('Unbalanced brackets')
+            key = k[start + 1:end]
+            if '[' in key:
+                raise UnbalancedBrackets(
+                    'Using brackets as key is not allowed')
+            notation.append(key)
+            start = k.find('[', end + 1)
+            between = k[end + 1:start] if start >= 0 else k[end + 1:]
+            if ']' in between:
+                raise UnbalancedBrackets('Unbalanced brackets')
+            if between:
+                if start < 0:
+                    raise Unparsable('Nesting notation broken')
+                # text between nested keys - brackets still have to be validated till the end
+                broken = True
+        return None if broken else notation
+
     def _parse_array(self, k: str, v: str | list) -> None:
         """
         Parses key with array notation into a list of nested keys.
@@ -277,20 +458,21 @@ class QsParser(QS):
             self._parse_arrays = False
             self._to_obj()
             return self._parse_lhs(k, v)
+        qs_tree = self._qs_tree
         try:
             item = ArrayParse.process(notation, v)
-            item.set_index(self._qs_tree.get(item.key, None),
-                           array_limit=self._array_limit)
+            current = qs_tree.get(item.key, None)
+            item.set_index(current, array_limit=self._array_limit)
         except ArrayLimitReached:
             self._parse_arrays = False
             self._to_obj()
             return self._parse_lhs(k, v)
-        if item.key not in self._qs_tree:
-            if len(self._qs_tree) >= self._parameter_limit:
+        if current is None:
+            if len(qs_tree) >= self._parameter_limit:
                 return
-            self._qs_tree[item.key] = item
+            qs_tree[item.key] = item
         else:
-            self._qs_tree[item.key].update(item)
+            current.update(item)
 
     def _parse_lhs(self, k: str, v: str | list) -> None:
         """
@@ -306,12 +488,14 @@ class QsParser(QS):
             raise Unparsable('Unable to parse key')
         data = LHSParse.process(
             notation, v, depth=self._max_depth, allow_empty=self._allow_empty, allow_dots=self._allow_dots)
-        if data.key not in self._qs_tree:
-            if len(self._qs_tree) >= self._parameter_limit:
+        qs_tree = self._qs_tree
+        current = qs_tree.get(data.key, None)
+        if current is None:
+            if len(qs_tree) >= self._parameter_limit:
                 return
-            self._qs_tree[data.key] = data
+            qs_tree[data.key] = data
         else:
-            self._qs_tree[data.key].update(data)
+            current.update(data)
 
     def _process_primitive(self, v: str | list) -> t.Any:
         """
@@ -323,29 +507,47 @@ class QsParser(QS):
         Returns:
             Any: processed value
         """
-        v = self._from_array_like(v)
         if not self._parse_primitive:
+            if isinstance(v, str) and v[:1] == '[':
+                return self._from_array_like(v)
             return v
+        v = self._from_array_like(v)
         if isinstance(v, list):
-            return [self._process_primitive(item) for item in v]
+            # items are only converted to primitives - brackets nested in array-like value are kept as they are
+            return [self._parse_scalar(item) for item in v]
+        return self._parse_scalar(v)
+
+    def _parse_scalar(self, v: t.Any) -> t.Any:
+        """
+        Parses single primitive value into a proper type.
+
+        Args:
+            v (Any): value to parse - values which are not strings are already processed
+
+        Returns:
+            Any: parsed value
+        """
+        if not isinstance(v, str):
+            return v
         if v.isdigit():
             return int(v)
-        if not self._primitive_strict:
-            if v.lower() in ['true', 'false']:
-                return v.lower() == 'true'
-            if v.lower() in ['null', 'none']:
-                return None
+        if self._primitive_strict:
+            token, none_tokens = v, _NONE_STRICT
         else:
-            if v in ['true', 'false']:
-                return v == 'true'
-            if v in ['null', 'None']:
-                return None
+            token, none_tokens = v.lower(), _NONE_LOOSE
+        if token in _BOOL_TOKENS:
+            return token == 'true'
+        if token in none_tokens:
+            return None
+        if not v or (v[0].isascii() and v[0] not in _FLOAT_START):
+            # cannot be parsed as float - avoid raising ValueError
+            return v
         try:
             return float(v)
         except ValueError:
             return v
 
-    def _split_key(self, k: str) -> list[str] | None:
+    def _split_key(self, k: str) -> tuple[str, ...] | None:
         """
         Splits key into a main key and a list of nested keys.
 
@@ -353,27 +555,11 @@ class QsParser(QS):
             k (str): key to split
 
         Returns:
-            tuple[str, list[str]]: main key and list of nested keys or None, None if key is not parsable with current settings
-        """
-        if self._parse_arrays:
-            QsParser._check_brackets(k)
-            match_pattern = r'(\w+)(\[(.*)\])+' if not self._allow_empty else r'(\w*)(\[(.*)\])+'
-            match = re.match(match_pattern, k)
-            notation = re.findall(r'\[(.*?)\]', k)
-            return [match.group(1)] + notation if match else None
-        if self._allow_dots:
-            match = re.match(
-                r'(\w+)(\.\w+)+', k) if not self._allow_empty else re.match(r'(\w*)(\.(\w*))', k)
-            notation = re.findall(
-                r'\.(\w+)', k) if not self._allow_empty else re.findall(r'\.(\w*)', k)
-            if match:
-                return [match.group(1)] + notation
-        QsParser._check_brackets(k)
-        match_pattern = r'^(\w+)(\[\w+\])*$' if not self._allow_empty else r'^(\w*)(\[\w*\])*$'
-        match = re.match(match_pattern, k)
-        notation = re.findall(
-            r'\[(\w+)\]', k) if not self._allow_empty else re.findall(r'\[(\w*)\]', k)
-        return [match.group(1)] + notation if match else None
+            tuple[str, ...]: main key followed by nested keys or None if key is not parsable with current settings
+        """
+        if len(k) > _CACHE_MAX_KEY_LENGTH:
+            return _split_key_notation(k, self._parse_arrays, self._allow_empty, self._allow_dots)
+        return _split_key_cached(k, self._parse_arrays, self._allow_empty, self._allow_dots)
 
     def _to_obj(self) -> None:
         """
@@ -389,6 +575,47 @@ class QsParser(QS):
             v.to_object_notation()
 
 
+def _split_key_notation(k: str, parse_arrays: bool, allow_empty: bool, allow_dots: bool) -> tuple[str, ...] | None:
+    """
+    Splits key into a main key and a list of nested keys.
+
+    Args:
+        k (str): key to split
+        parse_arrays (bool): parse array notation
+        allow_empty (bool): allow empty keys
+        allow_dots (bool): allow dot notation
+
+    Returns:
+        tuple[str, ...]: main key followed by nested keys or None if key is not parsable with given settings
+
+    Raises:
+        UnbalancedBrackets: if brackets are unbalanced
+        Unparsable: if nesting notation is broken
+    """
+    if parse_arrays:
+        QsParser._check_brackets(k)
+        head, bracket, tail = k.partition('[')
+        if not bracket or not _is_word(head, allow_empty):
+            return None
+        # brackets are validated - every part holds exactly one closing bracket
+        return _intern_keys((head, *[part.partition(']')[0] for part in tail.split('[')]))
+    if allow_dots:
+        notation = _split_dots(k, allow_empty)
+        if notation is not None:
+            return _intern_keys(notation)
+    notation = QsParser._scan_brackets(k)
+    if notation is None:
+        return None
+    for key in notation:
+        if not _is_word(key, allow_empty):
+            return None
+    return _intern_keys(notation)
+
+
+# same keys tend to repeat - results of splitting short keys are cached
+_split_key_cached = lru_cache(maxsize=4096)(_split_key_notation)
+
+
 def parse(
         data: str,
         from_url: bool = False,
@@ -434,12 +661,16 @@ def parse(
         qs = data
     args = []
     try:
-        query_args = re.split(delimiter, qs)
-        if charset_sentinel:
+        query_args = _split_args(qs, delimiter)
+        if charset_sentinel and 'utf8=' in qs:
             charset = QsParser._find_charset_sentinel(query_args) or charset
-        for arg in query_args:
-            args.append(QsParser._unq(
-                arg, charset, interpret_numeric_entities))
+        if '%' not in qs and not (interpret_numeric_entities and any('&#' in arg for arg in query_args)):
+            # nothing to unquote or unescape in whole query string
+            args = [QsParser._split_arg(arg) for arg in query_args]
+        else:
+            for arg in query_args:
+                args.append(QsParser._unq(
+                    arg, charset, interpret_numeric_entities))
         parser = QsParser(depth, parameter_limit, allow_dots,
                           array_limit, parse_arrays, allow_empty, comma, parse_primitive, primitive_strict)
         parser.parse(args)
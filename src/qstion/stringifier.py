@@ -1,12 +1,54 @@
 from .base import QS, QsNode
-import urllib.parse as up
+from collections import defaultdict
+from functools import partial
+from io import StringIO
+from operator import itemgetter
 import typing as t
 
 LIST_FORMAT_OPTIONS = ['indices', 'brackets', 'repeat', 'comma']
 
 
+# formatters of single nested key, chosen once per stringifier based on allow_dots and array_format
+def _fmt_brackets(key: t.Any) -> str:
+    return f'[{key}]'
+
+
+def _fmt_dots(key: t.Any) -> str:
+    return f'.{key}'
+
+
+def _fmt_brackets_collapse(key: t.Any) -> str:
+    return '[]' if isinstance(key, int) else f'[{key}]'
+
+
+def _fmt_brackets_omit(key: t.Any) -> str:
+    return '' if isinstance(key, int) else f'[{key}]'
+
+
+def _fmt_dots_collapse(key: t.Any) -> str:
+    return '.[]' if isinstance(key, int) else f'.{key}'
+
+
+def _fmt_dots_omit(key: t.Any) -> str:
+    return '' if isinstance(key, int) else f'.{key}'
+
+
+# innermost key formatters keyed by (allow_dots, array_format) - array indexes are collapsed or omitted
+_LEAF_FORMATTERS = {
+    (False, 'brackets'): _fmt_brackets_collapse,
+    (False, 'repeat'): _fmt_brackets_omit,
+    (True, 'brackets'): _fmt_dots_collapse,
+    (True, 'repeat'): _fmt_dots_omit,
+}
+
+
 class QsStringifier(QS):
-    _af: str = 'indices'
+    __slots__ = ('_af', '_key_cache', '_fmt_segment', '_fmt_leaf')
+
+    _af: str
+    _key_cache: dict[tuple, str]
+    _fmt_segment: t.Callable[[t.Any], str]
+    _fmt_leaf: t.Callable[[t.Any], str]
 
     def __init__(self, depth: int = 5, parameter_limit: int = 1000, allow_dots: bool = False, allow_sparse: bool = False, array_limit: int = 20, parse_arrays: bool = False, allow_empty: bool = False, comma: bool = False, array_format: str = 'indices'):
         super().__init__(depth, parameter_limit, allow_dots,
@@ -15,6 +57,9 @@ class QsStringifier(QS):
             raise ValueError(
                 f'array_format must be one of {LIST_FORMAT_OPTIONS}')
         self._af = array_format
+        self._key_cache = {}
+        self._fmt_segment = _fmt_dots if allow_dots else _fmt_brackets
+        self._fmt_leaf = _LEAF_FORMATTERS.get((allow_dots, array_format), self._fmt_segment)
 
     def stringify(self, data: dict, filter: list = None) -> list[tuple]:
         """
@@ -27,101 +72,172 @@ class QsStringifier(QS):
         Returns:    
             str: query string
         """
-        _q_args = {}
-        for item in data:
-            node = QsNode.load(
-                item,
-                data[item],
-                filter=filter)
-            if node is not None:
-                self._qs_tree[node.key] = node
-        for item in self._qs_tree.values():
-            for arg in self._get_arg(item):
-                if arg is None:
-                    continue
-                prepared_arg = self._transform_arg(arg)
-                if prepared_arg[0] in _q_args:
-                    _q_args[prepared_arg[0]] = [_q_args[prepared_arg[0]], prepared_arg[1]] if isinstance(
-                        _q_args[prepared_arg[0]], str) else [*_q_args[prepared_arg[0]], prepared_arg[1]]
-                else:
-                    _q_args[prepared_arg[0]] = prepared_arg[1]
+        if filter:
+            # membership is checked for every key - list is scanned linearly, set is hashed once
+            try:
+                filter = frozenset(filter)
+            except TypeError:
+                # unhashable items are only comparable by list scan
+                pass
+        if all(not isinstance(v, (dict, list)) for v in data.values()):
+            return self._stringify_flat(data, filter=filter)
+        _q_args = defaultdict(list)
+        load = QsNode.load
+        nodes = (load(key, value, filter=filter) for key, value in data.items())
+        # root nodes are only traversed in order (keys of data are unique), keyed access of tree is not needed
+        # empty roots (None or empty containers) produce no arguments - they are dropped before traversal
+        roots = [node for node in nodes if node is not None and (node.children or node.value is not None)]
+        get_arg, build_key = self._get_arg, self._build_key
+        key_cache = self._key_cache
+        for item in roots:
+            # cached nesting is only unambiguous within single root key
+            key_cache.clear()
+            # built keys are fresh strings hashed once on insertion - interning them would only add another lookup
+            for notation, value in get_arg(item):
+                _q_args[build_key(notation)].append(value)
         res = []
-        for key, value in _q_args.items():
-            if isinstance(value, list) and (self._af == 'repeat' or self._af == 'brackets'):
-                res += [(key, v) for v in value]
+        # formats which repeat the key for every value of an array
+        repeat_key = self._af in ('repeat', 'brackets')
+        for key, values in _q_args.items():
+            # root keys might not be strings - joiners expect str keys
+            key = str(key)
+            if len(values) == 1:
+                res.append((key, str(values[0])))
+            elif repeat_key:
+                res.extend((key, str(v)) for v in values)
             else:
-                res.append((key, str(value)))
+                res.append((key, str(values)))
         return res
 
-    def _format_key(self, key: list) -> str | None:
+    @staticmethod
+    def _stringify_flat(data: dict, filter: list = None) -> list[tuple]:
         """
-        Format key based on array_format into proper string representation recursively
+        Process a dictionary without nested values - no tree is needed as every key maps to single argument
 
         Args:
-            key (list): list of keys
+            data (dict): dictionary to process
+            filter (list): list of keys to filter
 
         Returns:
-            str: formatted key
+            list[tuple]: list of key-value pairs
         """
-        if len(key) == 1:
-            # decide based on array_format
-            k = key[0]
-            k = key[0]
-            if isinstance(k, int) and (self._af == 'repeat' or self._af == 'brackets'):
-                return '[]' if self._af == 'brackets' else None
-            else:
-                return f'[{k}]' if not self._allow_dots else k
-        else:
-            current_key = key.pop()
-            formatted = self._format_key(key)
-            if formatted is None:
-                return f'[{current_key}]' if not self._allow_dots else f'.{current_key}'
-            if self._allow_dots:
-                return f'{current_key}.{formatted}'
-            return f'[{current_key}]{formatted}'
-
-    def _get_arg(self, node: QsNode) -> tuple[str, t.Any]:
+        return [
+            (str(k), str(v)) for k, v in data.items()
+            if v is not None and not (filter and k not in filter)
+        ]
+
+    def _build_key(self, notation: tuple) -> str | t.Any:
         """
-        Get argument from node recursively as generator
+        Build key of argument from its notation, nested keys are formatted based on array_format
 
         Args:
-            node (QsNode): node to process
+            notation (tuple): notation of keys (from innermost to root key)
 
         Returns:
-            tuple[str, Any]: argument
+            str | Any: formatted key, root keys without nesting are kept raw (e.g. 0 and '0' are different arguments)
         """
-        if node.is_leaf():
-            if node.is_empty():
-                yield None
-            else:
-                yield ([node.key], node.value)
-        elif node.is_default_array() and self._af == 'comma':
-            yield ([node.key], ','.join([str(child.value) for child in node.children]))
-        else:
-            for child in node.children:
-                for arg in self._get_arg(child):
-                    yield arg if arg is None else ([*arg[0], node.key], arg[1])
-
-    def _transform_arg(self, arg: tuple[list, t.Any]) -> tuple[str, t.Any]:
+        end = len(notation) - 1
+        if not end:
+            return notation[0]
+        # root and outer keys are shared by all siblings - their fragments are joined only once
+        outer = notation[1:]
+        prefix = self._key_cache.get(outer)
+        if prefix is None:
+            prefix = ''.join((str(notation[end]), *map(self._fmt_segment, reversed(notation[1:end]))))
+            self._key_cache[outer] = prefix
+        # innermost key is formatted based on array_format
+        return prefix + self._fmt_leaf(notation[0])
+
+    def _get_arg(self, node: QsNode) -> list[tuple[tuple, t.Any]]:
         """
-        Transform argument into proper string format
+        Get arguments from node - tree is traversed depth-first with explicit stack, empty leafs are skipped
 
         Args:
-            arg (tuple[list, Any]): argument
+            node (QsNode): node to process
 
         Returns:
-            tuple[str, Any]: transformed argument
+            list[tuple[tuple, Any]]: arguments - notation of keys (from innermost to root key) and value
         """
-        notation, value = arg
-        if len(notation) == 1:
-            return (notation[0], value)
-        key = notation.pop()
-        nesting = self._format_key(notation)
-        if self._allow_dots:
-            key = f'{key}{("." + nesting) if nesting is not None else ""}'
-        else:
-            key = f'{key}{nesting or ""}'
-        return (key, value)
+        args = []
+        append = args.append
+        comma = self._af == 'comma'
+        # every node is stacked with keys of its ancestors (from innermost to root key)
+        stack = [(node, ())]
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            current, outer = pop()
+            if not current.children:
+                # leaf node - skipped if empty
+                if current.value is not None:
+                    append(((current.key, *outer), current.value))
+            elif comma and current.is_default_array():
+                # str values are used as they are, str() is called only for other types
+                append(((current.key, *outer), ','.join([
+                    child.value if type(child.value) is str else str(child.value) for child in current.children])))
+            else:
+                outer = (current.key, *outer)
+                extend((child, outer) for child in reversed(current.children))
+        return args
+
+
+def _join_values_encoded(pairs: t.Iterable[tuple[str, str]], delimiter: str = '&', charset: str = 'utf-8') -> str:
+    """
+    Joins key-value pairs into a query string, only values are encoded. Pairs are written into single buffer.
+    """
+    quote = QS._quote
+    buf = StringIO()
+    write = buf.write
+    sep = ''
+    for k, v in pairs:
+        write(sep)
+        write(k)
+        write('=')
+        write(quote(v, charset))
+        sep = delimiter
+    return buf.getvalue()
+
+
+def _join_raw(pairs: t.Iterable[tuple[str, str]], delimiter: str = '&', charset: str = 'utf-8') -> str:
+    """
+    Joins key-value pairs into a query string without encoding. Pairs are written into single buffer.
+    """
+    buf = StringIO()
+    write = buf.write
+    sep = ''
+    for k, v in pairs:
+        write(sep)
+        write(k)
+        write('=')
+        write(v)
+        sep = delimiter
+    return buf.getvalue()
+
+
+def _make_encoder(
+        encode: bool,
+        encode_values_only: bool,
+        delimiter: str,
+        charset: str
+) -> t.Callable[[t.Iterable[tuple[str, str]]], str]:
+    """
+    Selects function joining key-value pairs into a query string, delimiter and charset are bound in advance.
+
+    Args:
+        encode (bool): encode values and keys
+        encode_values_only (bool): encode only values
+        delimiter (str): delimiter to use
+        charset (str): charset to use
+
+    Returns:
+        Callable: function taking key-value pairs and returning query string
+    """
+    if encode:
+        join = QS._encode_pairs
+    elif encode_values_only:
+        join = _join_values_encoded
+    else:
+        join = _join_raw
+    return partial(join, delimiter=delimiter, charset=charset)
 
 
 def stringify(
@@ -160,13 +276,11 @@ def stringify(
         allow_dots=allow_dots,
         array_format=array_format
     )
+    encoder = _make_encoder(encode, encode_values_only, delimiter, charset)
     _qt = qs.stringify(data, filter=filter)
     if charset_sentinel:
         _qt.insert(0, ('utf8', '✓'))
     if sort:
-        _qt = sorted(_qt, key=lambda x: x[0], reverse=sort_reverse)
-    if encode:
-        return delimiter.join([qs._q(k, v, charset=charset) for k, v in _qt])
-    elif encode_values_only:
-        return delimiter.join([f'{k}={up.quote(v, encoding=charset, errors="xmlcharrefreplace")}' for k, v in _qt])
-    return delimiter.join([f'{k}={v}' for k, v in _qt])
+        # pairs are fresh list - sorted in place by key only
+        _qt.sort(key=itemgetter(0), reverse=sort_reverse)
+    return encoder(_qt)
@@ -1,4 +1,5 @@
 import unittest
+import re
 import sys
 sys.path.append(".")
 
@@ -58,6 +59,16 @@ class ParserTest(unittest.TestCase):
             qs.parse('a=b;c=d,e=f', delimiter=r'[;,]'),
             {'a': 'b', 'c': 'd', 'e': 'f'})
 
+        # precompiled regular expression delimiter
+        self.assertDictEqual(
+            qs.parse('a=b;c=d,e=f', delimiter=re.compile(r'[;,]')),
+            {'a': 'b', 'c': 'd', 'e': 'f'})
+
+        # multi character delimiter
+        self.assertDictEqual(
+            qs.parse('a=b;;c=d', delimiter=';;'),
+            {'a': 'b', 'c': 'd'})
+
         # dot notation
         self.assertDictEqual(
             qs.parse('a.b=c', allow_dots=True),
@@ -91,6 +102,11 @@ class ParserTest(unittest.TestCase):
                      interpret_numeric_entities=True, charset='iso-8859-1'),
             {'a': '☺'})
 
+        # named entities are not interpreted
+        self.assertDictEqual(
+            qs.parse('a=%26%239786%3B%26amp%3B', interpret_numeric_entities=True),
+            {'a': '☺&amp;'})
+
     def test_advanced_parse_objects(self):
         import src.qstion as qs
 
@@ -149,6 +165,31 @@ class ParserTest(unittest.TestCase):
             qs.parse('a=[b,c]'),
             {'a': ['b', 'c']})
 
+        # only single pair of wrapping brackets is stripped from array value
+        self.assertDictEqual(
+            qs.parse('a=[[b,c]]'),
+            {'a': ['[b', 'c]']})
+
+        # literal text is kept as it is in charsets which do not encode ASCII as ASCII
+        self.assertDictEqual(
+            qs.parse('ab=c%41', charset='utf-16'),
+            {'ab': '䅣'})
+
+        # long keys are split without cache
+        self.assertDictEqual(
+            qs.parse('a[' + 'b' * 200 + ']=c'),
+            {'a': {'b' * 200: 'c'}})
+
+        # nested brackets are kept in items regardless of parse_arrays and parse_primitive
+        for options in ({}, {'parse_arrays': True}, {'parse_primitive': True},
+                        {'parse_arrays': True, 'parse_primitive': True}):
+            self.assertDictEqual(
+                qs.parse('a=[[a]]', **options),
+                {'a': ['[a]']})
+            self.assertDictEqual(
+                qs.parse('a=[b,[c]]', **options),
+                {'a': ['b', '[c]']})
+
         # test very empty objects
         self.assertDictEqual(
             qs.parse('a[]=&b[]=', allow_empty=True),
@@ -31,6 +31,12 @@ class StringifyTest(unittest.TestCase):
             'a=b&c[0]=d&c[1]=e%3Df&f[0][0]=g&f[1][0]=h'
         )
 
+        # full encoding takes precedence over encoding values only
+        self.assertEqual(
+            qs.stringify({'a': {'b': 'c d'}}, encode_values_only=True),
+            'a%5Bb%5D=c%20d'
+        )
+
         # When arrays are stringified, by default they are given explicit indices:
         self.assertEqual(
             qs.stringify({'a': ['b', 'c', 'd']}, encode=False),
@@ -139,6 +145,28 @@ class StringifyTest(unittest.TestCase):
             qs.stringify({'a': '☺'}, charset='iso-8859-1'),
             'a=%26%239786%3B')
 
+        self.assertEqual(
+            qs.stringify({'☺': '☺'}, charset='iso-8859-1',
+                         encode=False, encode_values_only=True),
+            '☺=%26%239786%3B')
+
+        # charsets which do not encode ASCII as ASCII are always percent-encoded
+        self.assertEqual(
+            qs.stringify({'a': 'b'}, charset='utf-16', charset_sentinel=True),
+            '%FF%FEu%00t%00f%008%00=%FF%FE%13%27&%FF%FEa%00=%FF%FEb%00')
+
+        self.assertEqual(
+            qs.stringify({'a': ''}, charset='utf-16'),
+            '%FF%FEa%00=')
+        self.assertEqual(
+            qs.stringify({'a': 'b c'}, charset='utf-16', encode=False, encode_values_only=True),
+            'a=%FF%FEb%00%20%00c%00')
+
+        # long values are encoded by runs of unsafe bytes
+        self.assertEqual(
+            qs.stringify({'a': 'é' * 40 + ' b'}),
+            'a=' + '%C3%A9' * 40 + '%20b')
+
         # You can use the charsetSentinel option to announce the character by including an utf8=✓ parameter with the proper encoding if the checkmark
 
         self.assertEqual(
@@ -199,5 +227,43 @@ class StringifyTest(unittest.TestCase):
         )
 
 
+        # dot notation with arrays
+        self.assertEqual(
+            qs.stringify({'a': ['b', 'c']}, allow_dots=True, encode=False),
+            'a.0=b&a.1=c'
+        )
+
+        # dot notation with repeated nested array
+        self.assertEqual(
+            qs.stringify({'a': {'b': ['c', 'd']}},
+                         allow_dots=True, array_format='repeat', encode=False),
+            'a.b=c&a.b=d'
+        )
+
+
+        # repeated non-string values
+        self.assertEqual(
+            qs.stringify({'a': [1, 2]}, array_format='repeat', encode=False),
+            'a=1&a=2'
+        )
+
+        self.assertEqual(
+            qs.stringify({'a': [1, 2]}, array_format='brackets'),
+            'a%5B%5D=1&a%5B%5D=2'
+        )
+
+        # non-string root keys
+        self.assertEqual(
+            qs.stringify({1: 'a', 'b': ['c']}, encode=False),
+            '1=a&b[0]=c'
+        )
+
+        # same text of int and str root keys is kept as separate arguments
+        self.assertEqual(
+            qs.stringify({0: 'a', '0': 'b', 'c': {'d': 'e'}}, encode=False),
+            '0=a&0=b&c[d]=e'
+        )
+
+
 if __name__ == "__main__":
     unittest.main()